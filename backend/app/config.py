@@ -31,12 +31,25 @@ class Settings(BaseSettings):
     PINECONE_API_KEY: str = Field(..., env="PINECONE_API_KEY")
     PINECONE_ENVIRONMENT: str = Field(..., env="PINECONE_ENVIRONMENT")
     PINECONE_INDEX_NAME: str = Field("research-plagiarism", env="PINECONE_INDEX_NAME")
+    PINECONE_QUERY_WORKERS: int = Field(8, env="PINECONE_QUERY_WORKERS")
 
     # ============================
     # EMBEDDINGS (local)
     # ============================
     EMBEDDING_MODEL_NAME: str = Field("BAAI/bge-large-en", env="EMBEDDING_MODEL_NAME")
     EMBEDDING_DIM: int = Field(1024, env="EMBEDDING_DIM")
+    EMBEDDING_BATCH_SIZE: int = Field(32, env="EMBEDDING_BATCH_SIZE")
+    # "torch" | "onnx" | "openvino" (non-torch backends need sentence-transformers[onnx] etc.)
+    EMBEDDING_BACKEND: str = Field("torch", env="EMBEDDING_BACKEND")
+    # Optional ONNX file inside the model repo, e.g. "onnx/model_O3.onnx" or an int8
+    # variant produced by sentence_transformers.export_dynamic_quantized_onnx_model
+    EMBEDDING_ONNX_FILE: Optional[str] = Field(None, env="EMBEDDING_ONNX_FILE")
+    # 0 keeps PyTorch's default intra-op thread count
+    EMBEDDING_NUM_THREADS: int = Field(0, env="EMBEDDING_NUM_THREADS")
+    # Half-precision inference; only applied to the torch backend on CUDA
+    EMBEDDING_FP16: bool = Field(False, env="EMBEDDING_FP16")
+    # Max texts kept in the in-process embedding cache (0 disables it)
+    EMBEDDING_CACHE_SIZE: int = Field(4096, env="EMBEDDING_CACHE_SIZE")
 
     # ============================
     # AZURE BLOB (ONLY WHEN USE_LOCAL_STORAGE=false)
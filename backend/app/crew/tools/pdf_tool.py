@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Dict, List
 from app.config import get_settings
 from app.services.pdf_parser import parse_pdf_to_text_and_images
@@ -5,9 +6,12 @@ from app.services.pdf_parser import parse_pdf_to_text_and_images
 settings = get_settings()
 
 
+@lru_cache(maxsize=16)
 def load_pdf(file_id: str) -> Dict[str, List[str]]:
     """
     Given a file_id (UUID name of stored PDF), load and parse it.
+    Uploads are immutable, so repeat analyses of the same file reuse the parse
+    (and its rendered page images) instead of re-extracting every page.
     """
     import os
 
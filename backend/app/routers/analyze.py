@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 
 from app.crew.orchestrator import run_full_analysis
@@ -11,7 +12,9 @@ router = APIRouter(prefix="/api", tags=["analyze"])
 @router.post("/analyze/", response_model=AnalysisResult)
 async def analyze(file_id: str):
     try:
-        result = run_full_analysis(file_id=file_id)
+        # The crew pipeline is synchronous and long-running; keep it off the event loop
+        # so uploads and other requests are served while an analysis is in progress.
+        result = await run_in_threadpool(run_full_analysis, file_id=file_id)
     except Exception as e:
         logger.exception("Analysis failed")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {e}")
@@ -9,6 +9,8 @@ from app.models.schemas import UploadResponse
 settings = get_settings()
 router = APIRouter(prefix="/api/uploads", tags=["uploads"])
 
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 @router.post("/", response_model=UploadResponse)
 async def upload_pdf(file: UploadFile = File(...)):
@@ -22,9 +24,10 @@ async def upload_pdf(file: UploadFile = File(...)):
     file_id = str(uuid.uuid4())
     dest_path = os.path.join(uploads_dir, f"{file_id}.pdf")
 
-    content = await file.read()
+    # Stream to disk so the whole PDF is never held in memory at once.
     with open(dest_path, "wb") as f:
-        f.write(content)
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            f.write(chunk)
 
     return JSONResponse(
         content=UploadResponse(file_id=file_id, filename="paper.pdf").dict()
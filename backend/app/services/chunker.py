@@ -1,14 +1,34 @@
 def chunk_text(text: str, max_chars: int = 4000):
+    """
+    Split text on line boundaries into chunks of fewer than max_chars characters
+    (newlines excluded), or a single line if it is longer on its own.
+    Chunks are sliced from text by offset rather than split into lines and re-joined.
+    """
+    # A text no longer than max_chars can never be split; skip the line walk.
+    if len(text) <= max_chars:
+        return [text]
+
     chunks = []
-    current = []
+    start = 0  # offset where the current chunk begins
+    size = 0  # characters in the current chunk, excluding newlines
+    pos = 0
+    n = len(text)
+
+    while True:
+        end = text.find("\n", pos)
+        if end == -1:
+            end = n
 
-    for line in text.split("\n"):
-        if sum(len(x) for x in current) + len(line) >= max_chars:
-            chunks.append("\n".join(current))
-            current = []
-        current.append(line)
+        line_len = end - pos
+        if size + line_len >= max_chars and pos > start:
+            chunks.append(text[start:pos - 1])
+            start = pos
+            size = 0
+        size += line_len
 
-    if current:
-        chunks.append("\n".join(current))
+        if end == n:
+            break
+        pos = end + 1
 
+    chunks.append(text[start:])
     return chunks
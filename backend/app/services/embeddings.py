@@ -1,19 +1,105 @@
-from functools import lru_cache
-from typing import List
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List
 
-from sentence_transformers import SentenceTransformer
+import numpy as np
 
 from app.config import get_settings
 
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
 settings = get_settings()
 
+# blake2b(text) -> embedding row; LRU-bounded by EMBEDDING_CACHE_SIZE.
+_embedding_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
+# Concurrent analyses can hit a cold worker together; only one may load the model.
+_model: "SentenceTransformer | None" = None
+_model_lock = threading.Lock()
+
+
+def get_embedding_model() -> "SentenceTransformer":
+    global _model
+    if _model is not None:
+        return _model
+
+    with _model_lock:
+        if _model is None:
+            _model = _load_embedding_model()
+        return _model
+
+
+def _load_embedding_model() -> "SentenceTransformer":
+    # torch / sentence-transformers are imported on first use so that importing
+    # this module (e.g. via the crew tools at app startup) stays cheap.
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if settings.EMBEDDING_NUM_THREADS > 0:
+        torch.set_num_threads(settings.EMBEDDING_NUM_THREADS)
+
+    # backend= / model_kwargs= need sentence-transformers>=3.2; only pass them
+    # when asked for, so the default torch path works on older releases too.
+    kwargs = {}
+    if settings.EMBEDDING_BACKEND != "torch":
+        kwargs["backend"] = settings.EMBEDDING_BACKEND
+        if settings.EMBEDDING_BACKEND == "onnx" and settings.EMBEDDING_ONNX_FILE:
+            kwargs["model_kwargs"] = {"file_name": settings.EMBEDDING_ONNX_FILE}
+
+    model = SentenceTransformer(settings.EMBEDDING_MODEL_NAME, **kwargs)
 
-@lru_cache
-def get_embedding_model() -> SentenceTransformer:
-    return SentenceTransformer(settings.EMBEDDING_MODEL_NAME)
+    if settings.EMBEDDING_FP16 and settings.EMBEDDING_BACKEND == "torch" and torch.cuda.is_available():
+        model.half()
+
+    return model
+
+
+def _text_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
 
 
 def embed_texts(texts: List[str]) -> List[list]:
-    model = get_embedding_model()
-    vectors = model.encode(texts, convert_to_numpy=False)
-    return [v.tolist() for v in vectors]
+    """
+    Embed texts with the shared model. Texts seen recently (or repeated within
+    this call) are served from an in-process cache and never re-encoded.
+    """
+    if not texts:
+        return []
+
+    keys = [_text_key(t) for t in texts]
+    found = {}
+
+    with _embedding_cache_lock:
+        for k in keys:
+            v = _embedding_cache.get(k)
+            if v is not None:
+                _embedding_cache.move_to_end(k)
+                found[k] = v
+
+    misses = {k: t for k, t in zip(keys, texts) if k not in found}
+
+    if misses:
+        model = get_embedding_model()
+        # Unit-normalize at encode time so cosine similarity reduces to a dot product.
+        # encode() sorts inputs by length before batching, so padding stays minimal.
+        vectors = model.encode(
+            list(misses.values()),
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+        ).astype(np.float32, copy=False)
+
+        with _embedding_cache_lock:
+            for k, v in zip(misses, vectors):
+                found[k] = v
+                # Copy so a cached row does not pin the whole batch matrix.
+                _embedding_cache[k] = v.copy()
+                _embedding_cache.move_to_end(k)
+            while len(_embedding_cache) > settings.EMBEDDING_CACHE_SIZE:
+                _embedding_cache.popitem(last=False)
+
+    # One bulk conversion of the (N, dim) matrix instead of one per row.
+    return np.stack([found[k] for k in keys]).tolist()
@@ -1,13 +1,27 @@
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Set
 import uuid
 
-import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 from app.config import get_settings
 from app.utils.logging import logger
 
 settings = get_settings()
 
+# Embeddings are stored as fixed-size float32 lists rather than list<double>,
+# halving their on-disk size and dropping per-row list offsets.
+PAPERS_SCHEMA = pa.schema(
+    [
+        pa.field("paper_id", pa.string()),
+        pa.field("title", pa.string()),
+        pa.field("summary", pa.string()),
+        pa.field("url", pa.string()),
+        pa.field("embedding", pa.list_(pa.float32(), settings.EMBEDDING_DIM)),
+    ]
+)
+
 
 def _get_parquet_path() -> str:
     root = settings.PARQUET_LOCAL_ROOT
@@ -15,6 +29,19 @@ def _get_parquet_path() -> str:
     return os.path.join(root, "papers.parquet")
 
 
+def get_existing_urls() -> Set[str]:
+    """
+    Return the set of paper URLs already stored in the local parquet file.
+    Only the url column is read, so this stays cheap as the store grows.
+    """
+    parquet_path = _get_parquet_path()
+
+    if not os.path.exists(parquet_path):
+        return set()
+
+    return set(pq.read_table(parquet_path, columns=["url"]).column("url").to_pylist())
+
+
 def append_new_papers(raw_papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Append new papers to a local parquet file, deduplicating by URL.
@@ -23,11 +50,12 @@ def append_new_papers(raw_papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     parquet_path = _get_parquet_path()
 
     if os.path.exists(parquet_path):
-        df_existing = pd.read_parquet(parquet_path)
+        # cast() also upgrades files written before embeddings were fixed-size float32.
+        table_existing = pq.read_table(parquet_path).cast(PAPERS_SCHEMA)
     else:
-        df_existing = pd.DataFrame(columns=["paper_id", "title", "summary", "url", "embedding"])
+        table_existing = PAPERS_SCHEMA.empty_table()
 
-    existing_urls = set(df_existing["url"].tolist()) if not df_existing.empty else set()
+    existing_urls = set(table_existing.column("url").to_pylist())
 
     records = []
     for p in raw_papers:
@@ -47,10 +75,31 @@ def append_new_papers(raw_papers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         logger.info("No new papers to append to parquet.")
         return []
 
-    df_new = pd.DataFrame(records)
-    df_all = pd.concat([df_existing, df_new], ignore_index=True)
+    # Build the new rows column-wise; embeddings go in as one contiguous float32 buffer.
+    embeddings = np.asarray([r["embedding"] for r in records], dtype=np.float32)
+    table_new = pa.table(
+        {
+            "paper_id": [r["paper_id"] for r in records],
+            "title": [r["title"] for r in records],
+            "summary": [r["summary"] for r in records],
+            "url": [r["url"] for r in records],
+            "embedding": pa.FixedSizeListArray.from_arrays(
+                pa.array(embeddings.ravel(), type=pa.float32()),
+                settings.EMBEDDING_DIM,
+            ),
+        },
+        schema=PAPERS_SCHEMA,
+    )
+    table_all = pa.concat_tables([table_existing, table_new])
 
-    df_all.to_parquet(parquet_path, index=False)
+    # Every column is near-unique per paper, so dictionary encoding only adds overhead.
+    pq.write_table(
+        table_all,
+        parquet_path,
+        compression="zstd",
+        compression_level=3,
+        use_dictionary=False,
+    )
     logger.info(f"Parquet updated at {parquet_path} with {len(records)} new papers.")
 
     return records
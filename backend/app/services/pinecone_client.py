@@ -1,3 +1,4 @@
+import threading
 from typing import List, Dict, Any
 
 from pinecone import Pinecone, ServerlessSpec
@@ -7,31 +8,55 @@ from app.utils.logging import logger
 
 settings = get_settings()
 
-pc = Pinecone(api_key=settings.PINECONE_API_KEY)
+# Pinecone recommends <=100 vectors (and <2MB) per upsert request.
+UPSERT_BATCH_SIZE = 100
 
-existing = [i["name"] for i in pc.list_indexes()]
+# First use can come from several query threads at once; only one may connect.
+_index = None
+_index_lock = threading.Lock()
 
-if settings.PINECONE_INDEX_NAME not in existing:
-    logger.info(f"Creating Pinecone index: {settings.PINECONE_INDEX_NAME}")
-    pc.create_index(
-        name=settings.PINECONE_INDEX_NAME,
-        dimension=settings.EMBEDDING_DIM,
-        metric="cosine",
-        spec=ServerlessSpec(
-            cloud="aws",
-            region=settings.PINECONE_ENVIRONMENT,
-        ),
-    )
 
-index = pc.Index(settings.PINECONE_INDEX_NAME)
+def get_index():
+    """
+    Connect to (and if needed create) the Pinecone index on first use rather
+    than at import, so importing the crew tools makes no network calls.
+    """
+    global _index
+    if _index is not None:
+        return _index
+
+    with _index_lock:
+        if _index is not None:
+            return _index
+
+        pc = Pinecone(api_key=settings.PINECONE_API_KEY)
+
+        existing = [i["name"] for i in pc.list_indexes()]
+
+        if settings.PINECONE_INDEX_NAME not in existing:
+            logger.info(f"Creating Pinecone index: {settings.PINECONE_INDEX_NAME}")
+            pc.create_index(
+                name=settings.PINECONE_INDEX_NAME,
+                dimension=settings.EMBEDDING_DIM,
+                metric="cosine",
+                spec=ServerlessSpec(
+                    cloud="aws",
+                    region=settings.PINECONE_ENVIRONMENT,
+                ),
+            )
+
+        _index = pc.Index(settings.PINECONE_INDEX_NAME)
+        return _index
 
 
 def upsert_vectors(vectors: List[Dict[str, Any]]) -> None:
-    index.upsert(vectors=vectors)
+    index = get_index()
+    for start in range(0, len(vectors), UPSERT_BATCH_SIZE):
+        index.upsert(vectors=vectors[start:start + UPSERT_BATCH_SIZE])
 
 
 def query_similar(vector: list, top_k: int = 5, filter: Dict[str, Any] | None = None):
-    res = index.query(
+    res = get_index().query(
         vector=vector,
         top_k=top_k,
         include_metadata=True,
@@ -1,18 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
+from app.config import get_settings
 from app.services.embeddings import embed_texts
 from app.services.pinecone_client import query_similar
 from app.models.schemas import PlagiarismMatch
 from app.utils.logging import logger
 
+settings = get_settings()
+
 
 def chunk_text(text: str, max_len: int = 800) -> List[str]:
     chunks: List[str] = []
     current: List[str] = []
     n = 0
 
+    # splitlines() already drops line terminators, so lines need no further stripping.
     for line in text.splitlines():
-        line = line.strip("\n")
         if not line:
             continue
 
@@ -35,15 +39,21 @@ def check_plagiarism(
     max_matches_per_chunk: int = 3,
     similarity_threshold: float = 0.85,
 ) -> List[PlagiarismMatch]:
-    chunks = chunk_text(text)
+    # Repeated chunks (running headers, boilerplate) would only repeat the same
+    # queries and matches; dedupe while keeping document order.
+    chunks = list(dict.fromkeys(chunk_text(text)))
     logger.info(f"Checking plagiarism on {len(chunks)} text chunks")
 
     vectors = embed_texts(chunks)
     results: List[PlagiarismMatch] = []
 
-    for chunk, vector in zip(chunks, vectors):
-        matches = query_similar(vector, top_k=max_matches_per_chunk)
+    # Each chunk is an independent Pinecone round trip; issue them concurrently.
+    with ThreadPoolExecutor(max_workers=settings.PINECONE_QUERY_WORKERS) as ex:
+        chunk_matches = list(
+            ex.map(lambda v: query_similar(v, top_k=max_matches_per_chunk), vectors)
+        )
 
+    for chunk, matches in zip(chunks, chunk_matches):
         for m in matches:
             if (m.score or 0.0) < similarity_threshold:
                 continue
@@ -1,71 +1,141 @@
-from typing import List, Dict, Any
+import asyncio
+import threading
+import time
+import xml.etree.ElementTree as ET
+from typing import List, Dict, Any, Tuple
 
 import httpx
-from bs4 import BeautifulSoup
 
 from app.utils.logging import logger
 from app.services.embeddings import embed_texts
-from app.services.parquet_store import append_new_papers
+from app.services.parquet_store import append_new_papers, get_existing_urls
 from app.services.pinecone_client import upsert_vectors
 
 ARXIV_API = "http://export.arxiv.org/api/query"
+ARXIV_PAGE_SIZE = 100
+ARXIV_PAGE_DELAY_SECONDS = 3
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ARXIV_CACHE_TTL_SECONDS = 900
 
+# (query, max_results) -> (monotonic fetch time, parsed entries)
+_search_cache: Dict[Tuple[str, int], Tuple[float, List[Dict[str, str]]]] = {}
+# crawler_tool runs each crawl under its own event loop in a worker thread.
+_search_cache_lock = threading.Lock()
 
-async def crawl_and_ingest(query: str, max_raw_results: int = 25) -> List[Dict[str, Any]]:
+
+async def _fetch_arxiv_page(client: httpx.AsyncClient, query: str, start: int, max_results: int) -> str:
     params = {
         "search_query": f"all:{query}",
-        "start": 0,
-        "max_results": max_raw_results,
+        "start": start,
+        "max_results": max_results,
     }
 
+    r = await client.get(ARXIV_API, params=params)
+    r.raise_for_status()
+    return r.text
+
+
+async def _fetch_arxiv_feeds(query: str, max_raw_results: int) -> List[str]:
+    """
+    Fetch up to max_raw_results entries in pages of ARXIV_PAGE_SIZE over one
+    connection, waiting ARXIV_PAGE_DELAY_SECONDS between pages as the arXiv
+    API terms ask.
+    """
+    pages = []
     async with httpx.AsyncClient(timeout=30) as client:
-        r = await client.get(ARXIV_API, params=params)
-        r.raise_for_status()
-        xml_data = r.text
-
-    soup = BeautifulSoup(xml_data, "xml")
-    entries = soup.find_all("entry")
-
-    raw_papers: List[Dict[str, Any]] = []
-    for e in entries:
-        raw_papers.append(
-            {
-                "title": e.title.text.strip(),
-                "summary": e.summary.text.strip(),
-                "url": e.id.text.strip(),
+        for start in range(0, max_raw_results, ARXIV_PAGE_SIZE):
+            if start:
+                await asyncio.sleep(ARXIV_PAGE_DELAY_SECONDS)
+            pages.append(
+                await _fetch_arxiv_page(client, query, start, min(ARXIV_PAGE_SIZE, max_raw_results - start))
+            )
+    return pages
+
+
+async def _search_arxiv(query: str, max_raw_results: int) -> List[Dict[str, Any]]:
+    """
+    Return parsed arXiv entries for the query, reusing results fetched within
+    the last ARXIV_CACHE_TTL_SECONDS. Callers get fresh dicts they may mutate.
+    """
+    key = (query, max_raw_results)
+    now = time.monotonic()
+    with _search_cache_lock:
+        cached = _search_cache.get(key)
+
+    if cached and now - cached[0] < ARXIV_CACHE_TTL_SECONDS:
+        logger.info(f"Using cached arXiv results for '{query}'")
+        return [dict(p) for p in cached[1]]
+
+    xml_pages = await _fetch_arxiv_feeds(query, max_raw_results)
+
+    # Keyed by URL so duplicate entries collapse before anything is embedded;
+    # abstracts arrive hard-wrapped, so whitespace is normalized as well.
+    # Only the three strings are kept; each page's element tree is dropped after parsing.
+    papers_by_url: Dict[str, Dict[str, str]] = {}
+    for xml_data in xml_pages:
+        for e in ET.fromstring(xml_data).iter(f"{ATOM_NS}entry"):
+            url = (e.findtext(f"{ATOM_NS}id") or "").strip()
+            if url in papers_by_url:
+                continue
+            papers_by_url[url] = {
+                "title": " ".join((e.findtext(f"{ATOM_NS}title") or "").split()),
+                "summary": " ".join((e.findtext(f"{ATOM_NS}summary") or "").split()),
+                "url": url,
             }
-        )
+    papers = list(papers_by_url.values())
+
+    with _search_cache_lock:
+        for k in [k for k, (ts, _) in _search_cache.items() if now - ts >= ARXIV_CACHE_TTL_SECONDS]:
+            del _search_cache[k]
+        _search_cache[key] = (now, papers)
+
+    return [dict(p) for p in papers]
+
+
+async def crawl_and_ingest(query: str, max_raw_results: int = 25) -> List[Dict[str, Any]]:
+    # The arXiv round trips and the parquet read are independent; overlap them.
+    raw_papers, existing_urls = await asyncio.gather(
+        _search_arxiv(query, max_raw_results),
+        asyncio.to_thread(get_existing_urls),
+    )
 
     if not raw_papers:
         logger.info("Crawler found 0 papers.")
         return []
 
+    # arXiv IDs are immutable, so papers already in parquet never need re-embedding.
+    raw_papers = [p for p in raw_papers if p["url"] not in existing_urls]
+
+    if not raw_papers:
+        logger.info("Crawler found no papers that are not already stored.")
+        return []
+
     summaries = [p["summary"] for p in raw_papers]
-    embeddings = embed_texts(summaries)
+    # Encoding, parquet writes and Pinecone upserts are blocking; keep them off the event loop.
+    embeddings = await asyncio.to_thread(embed_texts, summaries)
 
     for p, emb in zip(raw_papers, embeddings):
         p["embedding"] = emb
 
-    new_papers = append_new_papers(raw_papers)
+    new_papers = await asyncio.to_thread(append_new_papers, raw_papers)
 
     if not new_papers:
         return []
 
-    vectors = []
-    for p in new_papers:
-        vectors.append(
-            {
-                "id": p["paper_id"],
-                "values": p["embedding"],
-                "metadata": {
-                    "title": p["title"],
-                    "url": p["url"],
-                    "text": p["summary"],
-                },
-            }
-        )
-
-    upsert_vectors(vectors)
+    vectors = [
+        {
+            "id": p["paper_id"],
+            "values": p["embedding"],
+            "metadata": {
+                "title": p["title"],
+                "url": p["url"],
+                "text": p["summary"],
+            },
+        }
+        for p in new_papers
+    ]
+
+    await asyncio.to_thread(upsert_vectors, vectors)
 
     logger.info(f"Added {len(new_papers)} papers to Pinecone")
     return new_papers